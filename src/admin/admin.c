@@ -1010,6 +1010,33 @@ void phobos_admin_layout_list_free(struct layout_info *layouts, int n_layouts)
     dss_res_free(layouts, n_layouts);
 }
 
+void phobos_admin_layout_degroup(const struct layout_info *layouts,
+                                 int n_layouts, const char *medium,
+                                 struct layout_info *degroup, int *n_degroup)
+{
+    int count = 0;
+    int i;
+    int j;
+
+    for (i = 0; i < n_layouts; i++) {
+        for (j = 0; j < layouts[i].ext_count; j++) {
+            struct extent *extent = &layouts[i].extents[j];
+
+            if (medium && !strstr(extent->media.name, medium))
+                continue;
+
+            if (degroup) {
+                degroup[count] = layouts[i];
+                degroup[count].extents = extent;
+                degroup[count].ext_count = 1;
+            }
+            count++;
+        }
+    }
+
+    *n_degroup = count;
+}
+
 int phobos_admin_medium_locate(struct admin_handle *adm,
                                const struct pho_id *medium_id,
                                char **node_name)
@@ -1807,30 +1807,37 @@ class PhobosActionContext(object):
 
     def install_arg_parser(self):
         """Initialize hierarchical command line parser."""
+        self.parser = self.build_arg_parser()
+
+    @classmethod
+    def build_arg_parser(cls):
+        """Build the hierarchical command line parser."""
         # Top-level parser for common options
-        self.parser = argparse.ArgumentParser('phobos',
-                                              description= \
-                                              'phobos command line interface')
+        parser = argparse.ArgumentParser('phobos',
+                                         description= \
+                                         'phobos command line interface')
 
-        verb_grp = self.parser.add_mutually_exclusive_group()
+        verb_grp = parser.add_mutually_exclusive_group()
         verb_grp.add_argument('-v', '--verbose', help='Increase verbosity',
                               action='count', default=0)
         verb_grp.add_argument('-q', '--quiet', help='Decrease verbosity',
                               action='count', default=0)
 
-        self.parser.add_argument('-s', '--syslog', choices=SYSLOG_LOG_LEVELS,
-                                 help='also log via syslog with a given '
-                                      'verbosity')
-        self.parser.add_argument('-c', '--config',
-                                 help='Alternative configuration file')
+        parser.add_argument('-s', '--syslog', choices=SYSLOG_LOG_LEVELS,
+                            help='also log via syslog with a given '
+                                 'verbosity')
+        parser.add_argument('-c', '--config',
+                            help='Alternative configuration file')
 
-        sub = self.parser.add_subparsers(dest='goal')
+        sub = parser.add_subparsers(dest='goal')
         sub.required = True
 
         # Register misc actions handlers
-        for handler in self.supported_handlers:
+        for handler in cls.supported_handlers:
             handler.subparser_register(sub)
 
+        return parser
+
     def load_config(self):
         """Load configuration file."""
         cpath = self.parameters.get('config')
@@ -26,18 +26,52 @@ Provide access to admin commands with the right level (tm) of abstraction.
 import errno
 import json
 
-from ctypes import (addressof, byref, c_int, c_char_p, c_void_p, cast, pointer,
-                    POINTER, Structure)
+from ctypes import (addressof, byref, c_bool, c_char_p, c_int, c_uint,
+                    c_void_p, cast, memmove, memset, pointer, sizeof, POINTER,
+                    Structure)
 
 from phobos.core.const import (PHO_FS_LTFS, PHO_FS_POSIX, # pylint: disable=no-name-in-module
                                PHO_FS_RADOS, PHO_RSC_DIR,
                                PHO_RSC_TAPE, PHO_RSC_RADOS_POOL,
                                PHO_RSC_NONE, DSS_NONE,
                                str2rsc_family, str2dss_type)
-from phobos.core.glue import admin_device_status, jansson_dumps  # pylint: disable=no-name-in-module
+from phobos.core.glue import (admin_device_add, admin_device_lock, # pylint: disable=no-name-in-module
+                              admin_device_status, admin_device_unlock,
+                              jansson_dumps)
 from phobos.core.dss import DSSHandle
-from phobos.core.ffi import (CommInfo, ExtentInfo, LayoutInfo, LIBPHOBOS_ADMIN,
-                             Id)
+from phobos.core.ffi import CommInfo, LayoutInfo, LIBPHOBOS_ADMIN, Id
+
+# Resource family and filesystem type of each formattable filesystem
+_FS_TYPES = {
+    'ltfs': (PHO_RSC_TAPE, PHO_FS_LTFS),
+    'posix': (PHO_RSC_DIR, PHO_FS_POSIX),
+    'rados': (PHO_RSC_RADOS_POOL, PHO_FS_RADOS),
+}
+
+_ID_ARRAY_CACHE = {}
+_ID_SIZE = sizeof(Id)
+_ID_NAME_OFFSET = Id._name.offset # pylint: disable=protected-access
+_ID_NAME_SIZE = Id._name.size # pylint: disable=protected-access
+
+def _id_array(family, names):
+    """Build a ctypes array of Id of the given family from a list of names."""
+    n_ids = len(names)
+    id_array_type = _ID_ARRAY_CACHE.get(n_ids)
+    if id_array_type is None:
+        id_array_type = _ID_ARRAY_CACHE.setdefault(n_ids, Id * n_ids)
+
+    ids = id_array_type()
+    base = addressof(ids)
+    for i, name in enumerate(names):
+        enc_name = name.encode('utf-8')
+        if len(enc_name) >= _ID_NAME_SIZE:
+            raise ValueError("name too long: '%s'" % name)
+
+        ids[i].family = family
+        # the array is zero-filled, copying the name keeps it NUL-terminated
+        memmove(base + i * _ID_SIZE + _ID_NAME_OFFSET, enc_name, len(enc_name))
+
+    return ids
 
 class AdminHandle(Structure): # pylint: disable=too-few-public-methods
     """Admin handler"""
@@ -47,6 +81,73 @@ class AdminHandle(Structure): # pylint: disable=too-few-public-methods
         ('daemon_is_online', c_int),
     ]
 
+def _admin_function(name, restype, argtypes):
+    """Resolve a libphobos_admin function and declare its prototype."""
+    func = getattr(LIBPHOBOS_ADMIN, name)
+    func.restype = restype
+    func.argtypes = argtypes
+    return func
+
+_ADMIN_HANDLE_P = POINTER(AdminHandle)
+
+_PHOBOS_ADMIN_INIT = _admin_function('phobos_admin_init', c_int,
+                                     [_ADMIN_HANDLE_P, c_bool])
+_PHOBOS_ADMIN_FINI = _admin_function('phobos_admin_fini', None,
+                                     [_ADMIN_HANDLE_P])
+_PHOBOS_ADMIN_FORMAT = _admin_function('phobos_admin_format', c_int,
+                                       [_ADMIN_HANDLE_P, POINTER(Id), c_int,
+                                        c_int, c_int, c_bool])
+_PHOBOS_ADMIN_DRIVE_MIGRATE = _admin_function('phobos_admin_drive_migrate',
+                                              c_int,
+                                              [_ADMIN_HANDLE_P, POINTER(Id),
+                                               c_uint, c_char_p,
+                                               POINTER(c_uint)])
+_PHOBOS_ADMIN_DEVICE_DELETE = _admin_function('phobos_admin_device_delete',
+                                              c_int,
+                                              [_ADMIN_HANDLE_P, POINTER(Id),
+                                               c_int, POINTER(c_int)])
+_PHOBOS_ADMIN_PING = _admin_function('phobos_admin_ping', c_int,
+                                     [_ADMIN_HANDLE_P])
+_PHOBOS_ADMIN_LAYOUT_LIST = _admin_function('phobos_admin_layout_list', c_int,
+                                            [_ADMIN_HANDLE_P, POINTER(c_char_p),
+                                             c_int, c_bool, c_char_p,
+                                             POINTER(POINTER(LayoutInfo)),
+                                             POINTER(c_int)])
+_PHOBOS_ADMIN_LAYOUT_DEGROUP = _admin_function('phobos_admin_layout_degroup',
+                                               None,
+                                               [POINTER(LayoutInfo), c_int,
+                                                c_char_p, POINTER(LayoutInfo),
+                                                POINTER(c_int)])
+_PHOBOS_ADMIN_LAYOUT_LIST_FREE = _admin_function(
+    'phobos_admin_layout_list_free', None, [POINTER(LayoutInfo), c_int])
+_PHOBOS_ADMIN_MEDIUM_LOCATE = _admin_function('phobos_admin_medium_locate',
+                                              c_int,
+                                              [_ADMIN_HANDLE_P, POINTER(Id),
+                                               POINTER(c_char_p)])
+_PHOBOS_ADMIN_CLEAN_LOCKS = _admin_function('phobos_admin_clean_locks', c_int,
+                                            [_ADMIN_HANDLE_P, c_bool, c_bool,
+                                             c_int, c_int, POINTER(c_char_p),
+                                             c_int])
+_PHOBOS_ADMIN_LIB_SCAN = _admin_function('phobos_admin_lib_scan', c_int,
+                                         [c_int, c_char_p, POINTER(c_void_p)])
+
+# Released admin handles, kept zeroed for reuse by the next initialization
+_HANDLE_POOL = []
+_HANDLE_POOL_MAX = 8
+
+def _acquire_handle():
+    """Get a zeroed admin handle, reusing a released one if available."""
+    try:
+        return _HANDLE_POOL.pop()
+    except IndexError:
+        return AdminHandle()
+
+def _release_handle(handle):
+    """Zero a finalized admin handle and keep it for later reuse."""
+    if len(_HANDLE_POOL) < _HANDLE_POOL_MAX:
+        memset(byref(handle), 0, sizeof(AdminHandle))
+        _HANDLE_POOL.append(handle)
+
 class Client(object):
     """Wrapper on the phobos admin client"""
     def __init__(self, lrs_required=True):
@@ -66,42 +167,34 @@ class Client(object):
         if self.handle is not None:
             self.fini()
 
-        self.handle = AdminHandle()
+        self.handle = _acquire_handle()
 
-        rc = LIBPHOBOS_ADMIN.phobos_admin_init(byref(self.handle), lrs_required)
+        rc = _PHOBOS_ADMIN_INIT(byref(self.handle), lrs_required)
         if rc:
             raise EnvironmentError(rc, 'Admin initialization failed')
 
     def fini(self):
         """Admin client finalization."""
         if self.handle is not None:
-            LIBPHOBOS_ADMIN.phobos_admin_fini(byref(self.handle))
+            _PHOBOS_ADMIN_FINI(byref(self.handle))
+            _release_handle(self.handle)
             self.handle = None
 
     def fs_format(self, media_list, nb_streams, fs_type, unlock=False):
         """Format media through the LRS layer."""
         fs_type = fs_type.lower()
-        if fs_type == 'ltfs':
-            rsc_family = PHO_RSC_TAPE
-            fs_type_enum = PHO_FS_LTFS
-        elif fs_type == 'posix':
-            rsc_family = PHO_RSC_DIR
-            fs_type_enum = PHO_FS_POSIX
-        elif fs_type == 'rados':
-            rsc_family = PHO_RSC_RADOS_POOL
-            fs_type_enum = PHO_FS_RADOS
-        else:
+        try:
+            rsc_family, fs_type_enum = _FS_TYPES[fs_type]
+        except KeyError:
             raise EnvironmentError(errno.EOPNOTSUPP,
                                    "Unknown filesystem type '%s'" % fs_type)
 
-        c_id = Id * len(media_list)
-        mstruct = [Id(rsc_family, name=medium_id) for medium_id in media_list]
-        rc = LIBPHOBOS_ADMIN.phobos_admin_format(byref(self.handle),
-                                                 c_id(*mstruct),
-                                                 len(media_list),
-                                                 nb_streams,
-                                                 fs_type_enum,
-                                                 unlock)
+        rc = _PHOBOS_ADMIN_FORMAT(byref(self.handle),
+                                  _id_array(rsc_family, media_list),
+                                  len(media_list),
+                                  nb_streams,
+                                  fs_type_enum,
+                                  unlock)
         if rc:
             raise EnvironmentError(rc,
                                    "Failed to format every medium in '%s'" %
@@ -109,27 +202,21 @@ class Client(object):
 
     def device_add(self, dev_family, dev_names, keep_locked):
         """Add devices to the LRS."""
-        c_id = Id * len(dev_names)
-        dev_ids = [Id(dev_family, name=name) for name in dev_names]
-
-        rc = LIBPHOBOS_ADMIN.phobos_admin_device_add(byref(self.handle),
-                                                     c_id(*dev_ids),
-                                                     len(dev_ids), keep_locked)
+        rc = admin_device_add(addressof(self.handle), dev_family, dev_names,
+                              keep_locked)
         if rc:
             raise EnvironmentError(rc, "Failed to add device(s) '%s'" %
                                    dev_names)
 
     def device_migrate(self, dev_names, host):
         """Migrate devices (for now, only tape drives)."""
-        c_id = Id * len(dev_names)
-        dev_ids = [Id(PHO_RSC_TAPE, name=name) for name in dev_names]
         c_host = c_char_p(host.encode('utf-8'))
-        count = c_int(0)
+        count = c_uint(0)
 
-        rc = LIBPHOBOS_ADMIN.phobos_admin_drive_migrate(byref(self.handle),
-                                                        c_id(*dev_ids),
-                                                        len(dev_ids), c_host,
-                                                        byref(count))
+        rc = _PHOBOS_ADMIN_DRIVE_MIGRATE(byref(self.handle),
+                                         _id_array(PHO_RSC_TAPE, dev_names),
+                                         len(dev_names), c_host,
+                                         byref(count))
         if rc:
             raise EnvironmentError(rc, "Failed to migrate device(s) '%s'" %
                                    dev_names)
@@ -138,14 +225,12 @@ class Client(object):
 
     def device_delete(self, dev_family, dev_names):
         """Remove devices to phobos system."""
-        c_id = Id * len(dev_names)
-        dev_ids = [Id(dev_family, name=name) for name in dev_names]
         count = c_int(0)
 
-        rc = LIBPHOBOS_ADMIN.phobos_admin_device_delete(byref(self.handle),
-                                                        c_id(*dev_ids),
-                                                        len(dev_ids),
-                                                        byref(count))
+        rc = _PHOBOS_ADMIN_DEVICE_DELETE(byref(self.handle),
+                                         _id_array(dev_family, dev_names),
+                                         len(dev_names),
+                                         byref(count))
 
         if rc:
             raise EnvironmentError(rc, "Failed to delete device(s) '%s'" %
@@ -155,32 +240,23 @@ class Client(object):
 
     def ping(self):
         """Ping the phobos daemon."""
-        rc = LIBPHOBOS_ADMIN.phobos_admin_ping(byref(self.handle))
+        rc = _PHOBOS_ADMIN_PING(byref(self.handle))
 
         if rc:
             raise EnvironmentError(rc, "Failed to ping phobosd")
 
     def device_lock(self, dev_family, dev_names, is_forced):
         """Wrapper for the device lock command."""
-        c_id = Id * len(dev_names)
-        dev_ids = [Id(dev_family, name=name) for name in dev_names]
-
-        rc = LIBPHOBOS_ADMIN.phobos_admin_device_lock(byref(self.handle),
-                                                      c_id(*dev_ids),
-                                                      len(dev_ids), is_forced)
+        rc = admin_device_lock(addressof(self.handle), dev_family, dev_names,
+                               is_forced)
         if rc:
             raise EnvironmentError(rc, "Failed to lock device(s) '%s'" %
                                    dev_names)
 
     def device_unlock(self, dev_family, dev_names, is_forced):
         """Wrapper for the device unlock command."""
-        c_id = Id * len(dev_names)
-        dev_ids = [Id(dev_family, name=name) for name in dev_names]
-
-        rc = LIBPHOBOS_ADMIN.phobos_admin_device_unlock(byref(self.handle),
-                                                        c_id(*dev_ids),
-                                                        len(dev_ids),
-                                                        is_forced)
+        rc = admin_device_unlock(addressof(self.handle), dev_family,
+                                 dev_names, is_forced)
         if rc:
             raise EnvironmentError(rc, "Failed to unlock device(s) '%s'" %
                                    dev_names)
@@ -190,7 +266,11 @@ class Client(object):
         return admin_device_status(addressof(self.handle), family)
 
     def layout_list(self, res, is_pattern, medium, degroup): # pylint: disable=too-many-locals
-        """List layouts."""
+        """List layouts.
+
+        The listed layouts are returned as a ctypes array, which must not be
+        used after releasing the layouts with layout_list_free.
+        """
         n_layouts = c_int(0)
         layouts = pointer(LayoutInfo())
 
@@ -199,40 +279,38 @@ class Client(object):
         enc_res = [elt.encode('utf-8') for elt in res]
         c_res_strlist = c_char_p * len(enc_res)
 
-        rc = LIBPHOBOS_ADMIN.phobos_admin_layout_list(byref(self.handle),
-                                                      c_res_strlist(*enc_res),
-                                                      len(enc_res),
-                                                      is_pattern,
-                                                      enc_medium,
-                                                      byref(layouts),
-                                                      byref(n_layouts))
+        rc = _PHOBOS_ADMIN_LAYOUT_LIST(byref(self.handle),
+                                       c_res_strlist(*enc_res),
+                                       len(enc_res),
+                                       is_pattern,
+                                       enc_medium,
+                                       byref(layouts),
+                                       byref(n_layouts))
         if rc:
             raise EnvironmentError(rc, "Failed to list the extent(s) '%s'" %
                                    res)
 
         if not degroup:
-            list_lyts = [layouts[i] for i in range(n_layouts.value)]
+            # Array view over the returned layouts, elements are only built
+            # when accessed
+            list_lyts = (cast(layouts, POINTER(LayoutInfo * n_layouts.value))[0]
+                         if n_layouts.value else (LayoutInfo * 0)())
         else:
-            list_lyts = []
-            for i in range(n_layouts.value):
-                ptr = layouts[i].extents
-                cnt = layouts[i].ext_count
-                for j in range(cnt):
-                    if medium is None or \
-                        medium in cast(ptr, POINTER(ExtentInfo))[j].media.name:
-                        lyt = type(layouts[i])()
-                        pointer(lyt)[0] = layouts[i]
-                        lyt.ext_count = 1
-                        lyt.extents = addressof(cast(ptr,
-                                                     POINTER(ExtentInfo))[j])
-                        list_lyts.append(lyt)
+            n_degroup = c_int(0)
+            _PHOBOS_ADMIN_LAYOUT_DEGROUP(layouts, n_layouts,
+                                         enc_medium, None,
+                                         byref(n_degroup))
+            list_lyts = (LayoutInfo * n_degroup.value)()
+            _PHOBOS_ADMIN_LAYOUT_DEGROUP(layouts, n_layouts,
+                                         enc_medium, list_lyts,
+                                         byref(n_degroup))
 
         return list_lyts, layouts, n_layouts
 
     def medium_locate(self, rsc_family, medium_id):
         """Locate a medium by calling phobos_admin_medium_locate API"""
         hostname = c_char_p(None)
-        rc = LIBPHOBOS_ADMIN.phobos_admin_medium_locate(
+        rc = _PHOBOS_ADMIN_MEDIUM_LOCATE(
             byref(self.handle),
             byref(Id(rsc_family, name=medium_id)),
             byref(hostname))
@@ -251,13 +329,13 @@ class Client(object):
         dev_family = (str2rsc_family(family_str) if family_str
                       else PHO_RSC_NONE)
 
-        rc = LIBPHOBOS_ADMIN.phobos_admin_clean_locks(byref(self.handle),
-                                                      global_mode,
-                                                      force,
-                                                      lock_type,
-                                                      dev_family,
-                                                      c_ids_strlist(*enc_ids),
-                                                      len(enc_ids))
+        rc = _PHOBOS_ADMIN_CLEAN_LOCKS(byref(self.handle),
+                                       global_mode,
+                                       force,
+                                       lock_type,
+                                       dev_family,
+                                       c_ids_strlist(*enc_ids),
+                                       len(enc_ids))
 
         if rc:
             raise EnvironmentError(rc, "Failed to clean lock(s)")
@@ -265,7 +343,7 @@ class Client(object):
     @staticmethod
     def layout_list_free(layouts, n_layouts):
         """Free a previously obtained layout list."""
-        LIBPHOBOS_ADMIN.phobos_admin_layout_list_free(layouts, n_layouts)
+        _PHOBOS_ADMIN_LAYOUT_LIST_FREE(layouts, n_layouts)
 
     @staticmethod
     def lib_scan(lib_type, lib_dev_path):
@@ -276,7 +354,7 @@ class Client(object):
         SCSI scan of a given device.
         """
         jansson_t = c_void_p(None)
-        LIBPHOBOS_ADMIN.phobos_admin_lib_scan(lib_type,
-                                              lib_dev_path.encode('utf-8'),
-                                              byref(jansson_t))
+        _PHOBOS_ADMIN_LIB_SCAN(lib_type,
+                               lib_dev_path.encode('utf-8'),
+                               byref(jansson_t))
         return json.loads(jansson_dumps(jansson_t.value))
@@ -75,7 +75,9 @@ static PyObject *py_admin_device_status(PyObject *self, PyObject *args)
         return NULL;
     }
 
+    Py_BEGIN_ALLOW_THREADS
     rc = phobos_admin_device_status(adm, family, &str);
+    Py_END_ALLOW_THREADS
     if (rc) {
         errno = -rc;
         PyErr_SetFromErrno(PyExc_EnvironmentError);
@@ -88,6 +90,116 @@ static PyObject *py_admin_device_status(PyObject *self, PyObject *args)
     return py_json_str;
 }
 
+/**
+ * Build an array of pho_id from a python sequence of device names.
+ * @param[in]   py_names    python sequence of str
+ * @param[in]   family      resource family of every built id
+ * @param[out]  n_ids       number of ids in the returned array
+ * @return                  an array to release with free(), or NULL with a
+ *                          python exception set on failure
+ */
+static struct pho_id *py_names2pho_ids(PyObject *py_names,
+                                       enum rsc_family family,
+                                       Py_ssize_t *n_ids)
+{
+    struct pho_id *ids;
+    PyObject *seq;
+    Py_ssize_t i;
+
+    seq = PySequence_Fast(py_names, "device names must be a sequence");
+    if (seq == NULL)
+        return NULL;
+
+    *n_ids = PySequence_Fast_GET_SIZE(seq);
+    ids = calloc(*n_ids ? *n_ids : 1, sizeof(*ids));
+    if (ids == NULL) {
+        Py_DECREF(seq);
+        PyErr_NoMemory();
+        return NULL;
+    }
+
+    for (i = 0; i < *n_ids; i++) {
+        const char *name;
+
+        name = PyUnicode_AsUTF8(PySequence_Fast_GET_ITEM(seq, i));
+        if (name == NULL)
+            goto err_free;
+
+        ids[i].family = family;
+        if (pho_id_name_set(&ids[i], name)) {
+            PyErr_Format(PyExc_ValueError, "device name too long: '%s'",
+                         name);
+            goto err_free;
+        }
+    }
+
+    Py_DECREF(seq);
+    return ids;
+
+err_free:
+    Py_DECREF(seq);
+    free(ids);
+    return NULL;
+}
+
+typedef int (*admin_device_func_t)(struct admin_handle *, struct pho_id *,
+                                   int, bool);
+
+/**
+ * Common implementation of the admin_device_{add,lock,unlock} glue
+ * functions: convert the device names and call the given admin function.
+ * @return          the admin function return code as a python int
+ */
+static PyObject *py_admin_device_call(PyObject *args, const char *format,
+                                      admin_device_func_t func)
+{
+    struct admin_handle *adm;
+    enum rsc_family family;
+    struct pho_id *dev_ids;
+    PyObject *py_names;
+    Py_ssize_t n_ids;
+    int flag;
+    int rc;
+
+    if (!PyArg_ParseTuple(args, format, &adm, &family, &py_names, &flag))
+        return NULL;
+
+    dev_ids = py_names2pho_ids(py_names, family, &n_ids);
+    if (dev_ids == NULL)
+        return NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    rc = func(adm, dev_ids, n_ids, flag);
+    Py_END_ALLOW_THREADS
+    free(dev_ids);
+
+    return PyLong_FromLong(rc);
+}
+
+static int admin_device_add(struct admin_handle *adm, struct pho_id *dev_ids,
+                            int num_dev, bool keep_locked)
+{
+    return phobos_admin_device_add(adm, dev_ids, num_dev, keep_locked);
+}
+
+static PyObject *py_admin_device_add(PyObject *self, PyObject *args)
+{
+    return py_admin_device_call(args, "liOp:admin_device_add",
+                                admin_device_add);
+}
+
+static PyObject *py_admin_device_lock(PyObject *self, PyObject *args)
+{
+    return py_admin_device_call(args, "liOp:admin_device_lock",
+                                phobos_admin_device_lock);
+}
+
+static PyObject *py_admin_device_unlock(PyObject *self, PyObject *args)
+{
+    return py_admin_device_call(args, "liOp:admin_device_unlock",
+                                phobos_admin_device_unlock);
+}
+
 static PyMethodDef GlueMethods[] = {
     {"jansson_dumps", py_jansson_dumps, METH_VARARGS,
      "Dump a jansson json_t (pointer as python int) to a python string and "
@@ -95,6 +207,15 @@ static PyMethodDef GlueMethods[] = {
     {"admin_device_status", py_admin_device_status, METH_VARARGS,
      "Call phobos_admin_device_status and copy the result string in a python "
      "string"},
+    {"admin_device_add", py_admin_device_add, METH_VARARGS,
+     "Build the device ids from a list of names and call "
+     "phobos_admin_device_add, returning its return code"},
+    {"admin_device_lock", py_admin_device_lock, METH_VARARGS,
+     "Build the device ids from a list of names and call "
+     "phobos_admin_device_lock, returning its return code"},
+    {"admin_device_unlock", py_admin_device_unlock, METH_VARARGS,
+     "Build the device ids from a list of names and call "
+     "phobos_admin_device_unlock, returning its return code"},
     {NULL, NULL, 0, NULL},
 };
 
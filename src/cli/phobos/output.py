@@ -27,62 +27,100 @@ from collections import OrderedDict
 import csv
 from io import StringIO
 import json
-import xml.dom.minidom
-import xml.etree.ElementTree
+from operator import itemgetter
+from xml.sax.saxutils import escape
 from tabulate import tabulate
 
 from phobos.core.utils import bytes2human
 
 import yaml
 
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper
+
+# Characters to escape in xml attribute values, on top of &, < and >
+XML_ATTR_ENTITIES = {'"': '&quot;', '\n': '&#10;', '\r': '&#13;', '\t': '&#9;'}
+
+def to_columns(rows, keys):
+    """Convert a list of dictionaries to a dictionary of value lists"""
+    return {key: [row.get(key) for row in rows] for key in keys}
+
 def csv_dump(data):
     """Convert a list of dictionaries to a csv string"""
+    keys = list(data[0])
+    cols = to_columns(data, keys)
     outbuf = StringIO()
-    writer = csv.DictWriter(outbuf, data[0].keys())
-    if hasattr(writer, 'writeheader'):
-        #pylint: disable=no-member
-        writer.writeheader()
-    else:
-        writer.writerow(dict((item, item) for item in data[0]))
-    writer.writerows(data)
+    writer = csv.writer(outbuf)
+    writer.writerow(keys)
+    writer.writerows(zip(*(cols[key] for key in keys)))
     out = outbuf.getvalue()
     outbuf.close()
     return out
 
 def xml_dump(data, item_type='item'):
     """Convert a list of dictionaries to xml"""
-    top = xml.etree.ElementTree.Element('phobos')
-    for item in data:
-        # xml only supports strings
-        item = {key: str(value) for key, value in item.items()}
-        children = xml.etree.ElementTree.Element(item_type, **item)
-        top.append(children)
-    rough_string = xml.etree.ElementTree.tostring(top)
-    reparsed = xml.dom.minidom.parseString(rough_string)
-    return reparsed.toprettyxml(indent="  ")
+    outbuf = StringIO()
+    outbuf.write('<?xml version="1.0" ?>\n')
+    if not data:
+        outbuf.write('<phobos/>\n')
+    else:
+        outbuf.write('<phobos>\n')
+        for item in data:
+            # xml only supports strings
+            outbuf.write('  <%s' % item_type)
+            for key, value in item.items():
+                outbuf.write(' %s="%s"' % (key, escape(str(value),
+                                                       XML_ATTR_ENTITIES)))
+            outbuf.write('/>\n')
+        outbuf.write('</phobos>\n')
+    out = outbuf.getvalue()
+    outbuf.close()
+    return out
+
+class YamlDumper(SafeDumper): # pylint: disable=too-many-ancestors
+    """Safe yaml dumper, representing ordered dicts as plain mappings"""
+
+YamlDumper.add_representer(OrderedDict, YamlDumper.represent_dict)
+
+def yaml_dump(data):
+    """Convert a list of dictionaries to yaml"""
+    return yaml.dump(data, Dumper=YamlDumper)
 
 def human_dump(data):
     """Convert a list of dictionaries to an identifier list text"""
-    out = "\n".join(str(list(item.values())[0]) for item in data)
+    if not data:
+        return ''
+
+    # Every item holds the same single displayed attribute
+    get_value = itemgetter(next(iter(data[0])))
+    out = "\n".join(map(str, map(get_value, data)))
 
     return out
 
 def human_pretty_dump(data):
     """Convert a list of dictionaries to human readable text"""
     # Convert space sizes to human readable sizes
-    space_size_attr = [
+    space_size_attr = frozenset([
         "stats.phys_spc_free",
         "stats.logc_spc_used",
         "stats.phys_spc_used"
-    ]
+    ])
+
+    if not data:
+        return ''
 
-    for obj in data:
-        for key, attr in obj.items():
-            if key in space_size_attr:
-                obj[key] = bytes2human(attr)
+    # Displayed objects all share the same keys
+    keys = list(data[0])
+    cols = to_columns(data, keys)
+    for key in keys:
+        if key in space_size_attr:
+            cols[key] = [bytes2human(attr) for attr in cols[key]]
 
     # Generate formatted printing
-    out = tabulate(data, headers="keys", tablefmt="github")
+    out = tabulate(zip(*(cols[key] for key in keys)), headers=keys,
+                   tablefmt="github")
     return out
 
 def filter_display_dict(objs, attrs, max_width):
@@ -90,33 +128,32 @@ def filter_display_dict(objs, attrs, max_width):
     info = [x.get_display_dict(max_width=max_width) for x in objs]
 
     # If all/* is an attribute, we fetch them all
-    obj_list = []
-    if 'all' in attrs or '*' in attrs:
-        obj_list = info
-    else:
-        for attr_dict in info:
-            obj_list.append(OrderedDict([(k, attr_dict[k]) for k in attrs
-                                         if k in attr_dict]))
+    if not frozenset(attrs).isdisjoint(('all', '*')):
+        return info
+
+    return [OrderedDict([(k, attr_dict[k]) for k in attrs if k in attr_dict])
+            for attr_dict in info]
 
-    return obj_list
+DUMP_FORMATS = {
+    'json' : json.dumps,
+    'yaml' : yaml_dump,
+    'xml'  : xml_dump,
+    'csv'  : csv_dump,
+    'human': human_dump,
+}
 
 def dump_object_list(objs, attr=None, max_width=None, fmt="human"):
     """Helper for user friendly object display."""
     if not objs:
         return
 
-    formats = {
-        'json' : json.dumps,
-        'yaml' : yaml.dump,
-        'xml'  : xml_dump,
-        'csv'  : csv_dump,
-        'human': human_dump,
-    }
-
-    if attr is not None and (len(attr) > 1 or attr == ['*'] or attr == ['all']):
-        formats['human'] = human_pretty_dump
+    if fmt == 'human' and attr is not None and \
+            (len(attr) > 1 or attr == ['*'] or attr == ['all']):
+        dump = human_pretty_dump
+    else:
+        dump = DUMP_FORMATS[fmt]
 
     objlist = filter_display_dict(objs, attr, max_width)
 
     # Remove the endstring newline generated by csv, yaml and xml formatters
-    print(formats[fmt](objlist).rstrip())
+    print(dump(objlist).rstrip())
@@ -34,9 +34,11 @@ from socket import gethostname
 from phobos.cli import PhobosActionContext
 from phobos.core.dss import MediaManager
 
+_SHORT_HOSTNAME = gethostname().split('.')[0]
+
 def gethostname_short():
     """Return short hostname"""
-    return gethostname().split('.')[0]
+    return _SHORT_HOSTNAME
 
 @contextmanager
 def output_intercept():
@@ -54,10 +56,14 @@ class CLIParametersTest(unittest.TestCase):
     This test exerts phobos command line parser with valid and invalid
     combinations.
     """
-    @staticmethod
-    def check_cmdline_valid(args):
+    @classmethod
+    def setUpClass(cls):
+        """Build the command line parser once for all test cases."""
+        cls.parser = PhobosActionContext.build_arg_parser()
+
+    def check_cmdline_valid(self, args):
         """Make sure a command line is seen as valid."""
-        PhobosActionContext(args)
+        self.parser.parse_args(args)
 
     def check_cmdline_exit(self, args, code=0):
         """Make sure a command line exits with a given error code."""
@@ -376,15 +382,15 @@ class DeviceAddTest(BasicExecutionTest):
     """
     def test_dir_add(self):
         """Test adding directories. Simple case."""
-        flist = []
-        for _ in range(5):
-            file = tempfile.NamedTemporaryFile()
-            self.pho_execute(['-v', 'dir', 'add', file.name])
-            flist.append(file)
-
-        for file in flist:
-            path = "%s:%s" % (gethostname_short(), file.name)
-            self.pho_execute(['-v', 'dir', 'list', '-o', 'all', path])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = [os.path.join(tmp_dir, "t%d" % i) for i in range(5)]
+            for path in paths:
+                open(path, 'w').close()
+                self.pho_execute(['-v', 'dir', 'add', path])
+
+            for path in paths:
+                path = "%s:%s" % (gethostname_short(), path)
+                self.pho_execute(['-v', 'dir', 'list', '-o', 'all', path])
 
     def test_dir_tags(self):
         """Test adding a directory with tags."""
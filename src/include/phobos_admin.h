@@ -221,6 +221,28 @@ int phobos_admin_layout_list(struct admin_handle *adm, const char **res,
  */
 void phobos_admin_layout_list_free(struct layout_info *layouts, int n_layouts);
 
+/**
+ * Split layouts into one layout per extent, keeping only the extents located
+ * on a given medium.
+ *
+ * The degrouped layouts share their strings and extents with \a layouts,
+ * which must be kept until the degrouped layouts are no longer used. They
+ * must not be released using phobos_admin_layout_list_free().
+ *
+ * \param[in]       layouts         Layouts to degroup.
+ * \param[in]       n_layouts       Number of layouts to degroup.
+ * \param[in]       medium          Medium filter, matched as a substring of
+ *                                  the extent medium names, or NULL to keep
+ *                                  every extent.
+ * \param[out]      degroup         Caller-allocated array receiving the
+ *                                  degrouped layouts, or NULL to only count
+ *                                  them.
+ * \param[out]      n_degroup       Number of degrouped layouts.
+ */
+void phobos_admin_layout_degroup(const struct layout_info *layouts,
+                                 int n_layouts, const char *medium,
+                                 struct layout_info *degroup, int *n_degroup);
+
 /**
  * Retrieve the name of the node which holds a medium or NULL if any node can
  * access this media.